@@ -6,88 +6,191 @@ Flask app exposing a simple Task API.
 
 Serverless on Vercel: export `app` for WSGI.
 Local dev: `python api/app.py` or `flask --app api/app.py run`
+Production (non-Vercel): gunicorn with threaded workers, see Procfile
 """
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+from flask import Flask, Response, jsonify, request
+from flask_orjson import OrjsonProvider
+from typing import Any, List, Optional, Tuple
+from werkzeug.routing import BaseConverter, ValidationError
+from werkzeug.wrappers import Response as WerkzeugResponse
+import hashlib
+import msgspec
+import orjson
 import os
 
 # Import DB helper functions (backend auto-selected at import)
 import db
 
 app = Flask(__name__)
-app.config['JSON_SORT_KEYS'] = False
+# orjson encodes straight to bytes; jsonify goes through app.json
+app.json = OrjsonProvider(app)
 app.config['TESTING'] = False
+# Bodies are read whole before decoding, so cap them (1 MB) instead of buffering any size
+app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024
+# At most this many tasks per bulk request: one batch is one INSERT transaction holding the
+# SQLite writer lock, so larger imports go in several requests
+BULK_MAX_ITEMS = 1000
 
-# Enable CORS only for local static server origin
-CORS(app, resources={r"/api/*": {"origins": ["http://localhost:5500"]}})
+
+class FastIntConverter(BaseConverter):
+    """Digits-only id segment parsed with a bare int(), skipping IntegerConverter's fixed_digits/min/max checks."""
+    regex = r"[0-9]+"
+
+    def to_python(self, value: str) -> int:
+        try:
+            return int(value)
+        except ValueError:
+            # e.g. past Python's int string-length limit; no match -> 404
+            raise ValidationError()
+
+
+app.url_map.converters['fint'] = FastIntConverter
+
+# Enable CORS only for local static server origin. The headers are constant,
+# so they are attached as-is instead of matching routes/origins per request.
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "http://localhost:5500",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
+@app.before_request
+def _preflight():
+    # Answer CORS preflights for existing API routes before any view runs;
+    # anything else falls through to Flask's normal 404/405 handling
+    if request.method == "OPTIONS" and request.path.startswith("/api/") and request.url_rule is not None:
+        return Response(status=204)
+
+
+@app.after_request
+def _cors(resp: Response) -> Response:
+    if resp is not _HEALTH_RESP and request.path.startswith("/api/"):
+        resp.headers.update(CORS_HEADERS)
+    return resp
+
+
+# Request bodies: msgspec checks types while decoding; a ValueError in
+# __post_init__ surfaces as msgspec.ValidationError with the same message
+class TaskInCreate(msgspec.Struct):
+    title: str
+
+    def __post_init__(self) -> None:
+        self.title = self.title.strip()
+        if not self.title:
+            raise ValueError("'title' is required")
+
+
+class UpdateIn(msgspec.Struct):
+    title: Optional[str] = None
+    done: Optional[bool] = None
+
+    def __post_init__(self) -> None:
+        if self.title is not None:
+            self.title = self.title.strip()
+            if not self.title:
+                raise ValueError("'title' cannot be empty")
+
+
+# Constant error bodies, encoded once at import
+NOT_FOUND = (orjson.dumps({"error": "Task not found"}), 404)
+INVALID_JSON = (orjson.dumps({"error": "Invalid JSON body"}), 400)
+TOO_LARGE = (orjson.dumps({"error": "Request body too large"}), 413)
+TOO_MANY_ITEMS = (orjson.dumps({"error": f"At most {BULK_MAX_ITEMS} tasks per bulk request"}), 413)
+
+
+def _err(pair: Tuple[bytes, int]) -> Response:
+    body, code = pair
+    return Response(body, code, mimetype="application/json")
+
+
+def _json_conditional(payload: Any) -> WerkzeugResponse:
+    """JSON 200 with a strong ETag of the body; 304 Not Modified when If-None-Match matches."""
+    body = orjson.dumps(payload)
+    resp = Response(body, 200, mimetype="application/json")
+    resp.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+    resp.headers["Cache-Control"] = "private, must-revalidate"
+    return resp.make_conditional(request)
+
+
+# Constant liveness response, built once and shared by every probe. Its CORS headers are
+# set here and _cors skips it, so nothing writes to it while requests share it across threads.
+_HEALTH_RESP = Response(b'{"status":"ok"}', 200, mimetype="application/json")
+_HEALTH_RESP.headers.update(CORS_HEADERS)
+
+
+@app.errorhandler(413)
+def too_large(_e):
+    return _err(TOO_LARGE)
 
 
 @app.get("/api/health")
 def health():
-    return jsonify({"status": "ok"}), 200
+    return _HEALTH_RESP
 
 
 @app.get("/api/tasks")
 def list_tasks():
     tasks = db.get_all_tasks()
-    return jsonify(tasks), 200
+    return _json_conditional(tasks)
 
 
-@app.get("/api/tasks/<int:task_id>")
+@app.get("/api/tasks/<fint:task_id>")
 def get_one(task_id: int):
     task = db.get_task(task_id)
     if not task:
-        return jsonify({"error": "Task not found"}), 404
-    return jsonify(task), 200
+        return _err(NOT_FOUND)
+    return _json_conditional(task)
 
 
 @app.post("/api/tasks")
 def create():
     try:
-        data = request.get_json(force=True, silent=False) or {}
-    except Exception:
-        return jsonify({"error": "Invalid JSON body"}), 400
-
-    title = (data.get("title") or "").strip()
-    if not title:
-        return jsonify({"error": "'title' is required"}), 400
+        data = msgspec.json.decode(request.get_data(cache=False), type=TaskInCreate)
+    except msgspec.ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except msgspec.DecodeError:
+        return _err(INVALID_JSON)
 
-    task = db.create_task(title)
+    task = db.create_task(data.title)
     return jsonify(task), 201
 
 
-@app.put("/api/tasks/<int:task_id>")
-def update(task_id: int):
+@app.post("/api/tasks:bulk")
+def bulk_create():
     try:
-        data = request.get_json(force=True, silent=False) or {}
-    except Exception:
-        return jsonify({"error": "Invalid JSON body"}), 400
+        items = msgspec.json.decode(request.get_data(cache=False), type=List[TaskInCreate])
+    except msgspec.ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except msgspec.DecodeError:
+        return _err(INVALID_JSON)
+    if len(items) > BULK_MAX_ITEMS:
+        return _err(TOO_MANY_ITEMS)
 
-    title = data.get("title")
-    done = data.get("done")
+    tasks = db.bulk_create_tasks([item.title for item in items])
+    return jsonify(tasks), 201
 
-    # Only allow bool for done when provided
-    if done is not None and not isinstance(done, bool):
-        return jsonify({"error": "'done' must be boolean"}), 400
 
-    if title is not None:
-        if not isinstance(title, str):
-            return jsonify({"error": "'title' must be string"}), 400
-        title = title.strip()
-        if title == "":
-            return jsonify({"error": "'title' cannot be empty"}), 400
+@app.put("/api/tasks/<fint:task_id>")
+def update(task_id: int):
+    try:
+        data = msgspec.json.decode(request.get_data(cache=False), type=UpdateIn)
+    except msgspec.ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except msgspec.DecodeError:
+        return _err(INVALID_JSON)
 
-    task = db.update_task(task_id, title=title, done=done)
+    task = db.update_task(task_id, title=data.title, done=data.done)
     if not task:
-        return jsonify({"error": "Task not found"}), 404
+        return _err(NOT_FOUND)
     return jsonify(task), 200
 
 
-@app.delete("/api/tasks/<int:task_id>")
+@app.delete("/api/tasks/<fint:task_id>")
 def delete(task_id: int):
     ok = db.delete_task(task_id)
     if not ok:
-        return jsonify({"error": "Task not found"}), 404
+        return _err(NOT_FOUND)
     return jsonify({"status": "deleted"}), 200
 
 
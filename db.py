@@ -10,19 +10,26 @@ Provides functions:
 - create_task(title)
 - update_task(id, title=None, done=None)
 - delete_task(id)
+- bulk_create_tasks(titles)
 
 Each returns simple Python dicts like {"id": 1, "title": "...", "done": True} or None when missing.
 """
 import os
+import queue
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 # Optional: Postgres, only imported if DATABASE_URL provided
 PG_AVAILABLE = False
 DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
 try:
     if DATABASE_URL:
-        import psycopg2
+        import psycopg
+        import psycopg_pool
         PG_AVAILABLE = True
 except Exception:
     PG_AVAILABLE = False
@@ -31,182 +38,347 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 SQLITE_PATH = os.path.join(BASE_DIR, 'backend', 'tasks.db')
 
 FORCE_BACKEND = os.getenv("FORCE_BACKEND", "").lower()  # 'memory' | 'sqlite' | 'postgres'
-
-
-class BackendBase:
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))  # server worker processes (gunicorn reads it too)
+SQLITE_READERS = int(os.getenv("SQLITE_READERS", "8"))  # read-only connections in the SQLite pool
+if SQLITE_READERS < 1:
+    # An empty reader queue would block every read forever
+    raise ValueError(f"SQLITE_READERS must be at least 1, got {SQLITE_READERS}")
+PG_POOL_MIN = int(os.getenv("PG_POOL_MIN", "5"))
+PG_POOL_MAX = int(os.getenv("PG_POOL_MAX", "25"))
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35+; older builds re-select the row instead
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# SQLite hands back done as a Python bool: the converter runs inside the sqlite3 binding for
+# columns declared BOOLEAN, and for `done AS "done [BOOLEAN]"` on files created with done INTEGER
+sqlite3.register_converter("BOOLEAN", lambda b: b == b"1")
+# Process-local read cache for the SQL backends. Off by default: a process only sees
+# its own writes, so enable it only when a single process serves the database.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "0").lower() in ("1", "true", "yes")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+
+class BackendBase(ABC):
+    @abstractmethod
     def get_all_tasks(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
     def create_task(self, title: str) -> Dict[str, Any]: ...
+
+    @abstractmethod
     def update_task(self, task_id: int, title: Optional[str], done: Optional[bool]) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
     def delete_task(self, task_id: int) -> bool: ...
 
+    @abstractmethod
+    def bulk_create_tasks(self, titles: List[str]) -> List[Dict[str, Any]]: ...
+
 
 class MemoryBackend(BackendBase):
+    """Struct-of-arrays store: slot i of each list holds one task.
+
+    Ids only grow and are never reused after a delete, so appending keeps slots in
+    id order and listing needs no sort. Deleted slots are tombstoned with id 0 and
+    compacted (order preserved) once they are half the store. done is stored as bool.
+    A write touches several lists and compaction renumbers slots, so every method
+    holds the lock while it uses a slot.
+    """
+
     def __init__(self) -> None:
-        self._data: Dict[int, Dict[str, Any]] = {}
+        self._ids: List[int] = []
+        self._titles: List[str] = []
+        self._dones: List[bool] = []
+        self._index: Dict[int, int] = {}  # id -> slot
+        self._dead = 0
         self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _to_dict(self, slot: int) -> Dict[str, Any]:
+        return {"id": self._ids[slot], "title": self._titles[slot], "done": self._dones[slot]}
+
+    def _append(self, title: str) -> Dict[str, Any]:
+        slot = len(self._ids)
+        self._ids.append(self._next_id)
+        self._titles.append(title)
+        self._dones.append(False)
+        self._index[self._next_id] = slot
+        self._next_id += 1
+        return self._to_dict(slot)
 
-    def _to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
-        return {"id": row["id"], "title": row["title"], "done": bool(row["done"])}
+    def _compact(self) -> None:
+        live = [slot for slot, task_id in enumerate(self._ids) if task_id]
+        self._ids = [self._ids[slot] for slot in live]
+        self._titles = [self._titles[slot] for slot in live]
+        self._dones = [self._dones[slot] for slot in live]
+        self._index = {task_id: slot for slot, task_id in enumerate(self._ids)}
+        self._dead = 0
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        return [self._to_dict(v) for v in sorted(self._data.values(), key=lambda r: r["id"])]
+        with self._lock:
+            rows = zip(self._ids, self._titles, self._dones)
+            if not self._dead:
+                return [{"id": i, "title": t, "done": d} for i, t, d in rows]
+            return [{"id": i, "title": t, "done": d} for i, t, d in rows if i]
 
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
-        row = self._data.get(task_id)
-        return self._to_dict(row) if row else None
+        with self._lock:
+            slot = self._index.get(task_id)
+            return self._to_dict(slot) if slot is not None else None
 
     def create_task(self, title: str) -> Dict[str, Any]:
-        task = {"id": self._next_id, "title": title, "done": False}
-        self._data[self._next_id] = task
-        self._next_id += 1
-        return self._to_dict(task)
+        with self._lock:
+            return self._append(title)
 
     def update_task(self, task_id: int, title: Optional[str], done: Optional[bool]) -> Optional[Dict[str, Any]]:
-        row = self._data.get(task_id)
-        if not row:
-            return None
-        if title is not None:
-            row["title"] = title
-        if done is not None:
-            row["done"] = bool(done)
-        return self._to_dict(row)
+        with self._lock:
+            slot = self._index.get(task_id)
+            if slot is None:
+                return None
+            if title is not None:
+                self._titles[slot] = title
+            if done is not None:
+                self._dones[slot] = bool(done)
+            return self._to_dict(slot)
 
     def delete_task(self, task_id: int) -> bool:
-        return self._data.pop(task_id, None) is not None
+        with self._lock:
+            slot = self._index.pop(task_id, None)
+            if slot is None:
+                return False
+            self._ids[slot] = 0
+            self._titles[slot] = ""
+            self._dead += 1
+            if self._dead * 2 > len(self._ids):
+                self._compact()
+            return True
+
+    def bulk_create_tasks(self, titles: List[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._append(title) for title in titles]
+
+
+class ConnectionPool:
+    """One shared writer plus a queue of read-only connections to a SQLite file (WAL mode).
+
+    WAL lets readers run alongside the writer, so reads never wait on the write lock.
+    """
+
+    def __init__(self, path: str, readers: int) -> None:
+        self.path = path
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL;")
+        self._writer.execute("PRAGMA synchronous=NORMAL;")
+        self._write_lock = threading.Lock()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(readers):
+            conn = self._connect(isolation_level=None)
+            conn.execute("PRAGMA query_only=1;")
+            self._readers.put(conn)
+
+    def _connect(self, **kwargs: Any) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            **kwargs,
+        )
+        conn.row_factory = sqlite3.Row
+        self._tune(conn)
+        return conn
+
+    @staticmethod
+    def _tune(conn: sqlite3.Connection) -> None:
+        # Per-connection settings, so every pooled connection gets them once when opened:
+        # 256 MB memory-mapped reads, up to 64 MB page cache, temp tables in memory
+        conn.execute("PRAGMA busy_timeout=5000;")
+        conn.execute("PRAGMA mmap_size=268435456;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+
+    @contextmanager
+    def read_conn(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def write_conn(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            yield self._writer
 
 
 class SQLiteBackend(BackendBase):
     def __init__(self, path: str) -> None:
         self.path = path
-        self.conn = sqlite3.connect(self.path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.pool = ConnectionPool(self.path, SQLITE_READERS)
+        # One fixed UPDATE statement per (title given, done given) so sqlite3's statement cache hits
+        returning = ' RETURNING id, title, done AS "done [BOOLEAN]"' if SQLITE_HAS_RETURNING else ""
+        self._update_sqls = {
+            (True, True): f"UPDATE tasks SET title = ?, done = ? WHERE id = ?{returning};",
+            (True, False): f"UPDATE tasks SET title = ? WHERE id = ?{returning};",
+            (False, True): f"UPDATE tasks SET done = ? WHERE id = ?{returning};",
+        }
         self._init_schema()
 
     def _init_schema(self) -> None:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                done INTEGER NOT NULL DEFAULT 0
-            );
-            """
-        )
-        self.conn.commit()
+        with self.pool.write_conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    done BOOLEAN NOT NULL DEFAULT 0
+                );
+                """
+            )
+            conn.commit()
 
     def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
-        return {"id": row["id"], "title": row["title"], "done": bool(row["done"])}
+        return {"id": row["id"], "title": row["title"], "done": row["done"]}
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT id, title, done FROM tasks ORDER BY id ASC;")
-        return [self._row_to_dict(r) for r in cur.fetchall()]
+        with self.pool.read_conn() as conn:
+            rows = conn.execute('SELECT id, title, done AS "done [BOOLEAN]" FROM tasks ORDER BY id ASC;').fetchall()
+        return [{"id": r["id"], "title": r["title"], "done": r["done"]} for r in rows]
 
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT id, title, done FROM tasks WHERE id = ?;", (task_id,))
-        row = cur.fetchone()
+        with self.pool.read_conn() as conn:
+            row = conn.execute('SELECT id, title, done AS "done [BOOLEAN]" FROM tasks WHERE id = ?;', (task_id,)).fetchone()
         return self._row_to_dict(row) if row else None
 
     def create_task(self, title: str) -> Dict[str, Any]:
-        cur = self.conn.cursor()
-        cur.execute("INSERT INTO tasks (title, done) VALUES (?, 0);", (title,))
-        self.conn.commit()
-        new_id = cur.lastrowid
+        # `with conn` commits on success and rolls back on error, so a failed write
+        # never leaves an open transaction on the shared writer for the next caller
+        with self.pool.write_conn() as conn, conn:
+            if SQLITE_HAS_RETURNING:
+                row = conn.execute(
+                    'INSERT INTO tasks (title, done) VALUES (?, 0) RETURNING id, title, done AS "done [BOOLEAN]";',
+                    (title,),
+                ).fetchone()
+                return self._row_to_dict(row)
+            new_id = conn.execute("INSERT INTO tasks (title, done) VALUES (?, 0);", (title,)).lastrowid
         return self.get_task(new_id)  # type: ignore
 
     def update_task(self, task_id: int, title: Optional[str], done: Optional[bool]) -> Optional[Dict[str, Any]]:
         if title is None and done is None:
             return self.get_task(task_id)
-        sets = []
         params: List[Any] = []
         if title is not None:
-            sets.append("title = ?")
             params.append(title)
         if done is not None:
-            sets.append("done = ?")
             params.append(1 if done else 0)
         params.append(task_id)
-        sql = f"UPDATE tasks SET {', '.join(sets)} WHERE id = ?;"
-        cur = self.conn.cursor()
-        cur.execute(sql, tuple(params))
-        self.conn.commit()
+        sql = self._update_sqls[(title is not None, done is not None)]
+        with self.pool.write_conn() as conn, conn:
+            cur = conn.execute(sql, tuple(params))
+            if SQLITE_HAS_RETURNING:
+                row = cur.fetchone()
+                return self._row_to_dict(row) if row else None
         return self.get_task(task_id)
 
     def delete_task(self, task_id: int) -> bool:
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM tasks WHERE id = ?;", (task_id,))
-        self.conn.commit()
+        with self.pool.write_conn() as conn, conn:
+            cur = conn.execute("DELETE FROM tasks WHERE id = ?;", (task_id,))
         return cur.rowcount > 0
 
+    def bulk_create_tasks(self, titles: List[str]) -> List[Dict[str, Any]]:
+        if not titles:
+            return []
+        with self.pool.write_conn() as conn, conn:
+            conn.executemany("INSERT INTO tasks (title, done) VALUES (?, 0);", [(title,) for title in titles])
+            # The write transaction stays open until commit, so AUTOINCREMENT hands out consecutive ids
+            last_id = conn.execute("SELECT last_insert_rowid();").fetchone()[0]
+        first_id = last_id - len(titles) + 1
+        return [{"id": first_id + n, "title": title, "done": False} for n, title in enumerate(titles)]
+
 
 class PostgresBackend(BackendBase):
     def __init__(self, url: str) -> None:
-        import psycopg2  # type: ignore
-        self.conn = psycopg2.connect(url)
+        from psycopg_pool import ConnectionPool as PgConnectionPool  # type: ignore
+        # autocommit: each statement commits itself; prepare_threshold=0: server-side prepare from the first run
+        self.pool = PgConnectionPool(
+            url,
+            min_size=PG_POOL_MIN,
+            max_size=PG_POOL_MAX,
+            kwargs={"autocommit": True, "prepare_threshold": 0},
+            open=True,
+        )
+        # One fixed UPDATE statement per (title given, done given)
+        self._update_sqls = {
+            (True, True): "UPDATE tasks SET title = %s, done = %s WHERE id = %s RETURNING id, title, done;",
+            (True, False): "UPDATE tasks SET title = %s WHERE id = %s RETURNING id, title, done;",
+            (False, True): "UPDATE tasks SET done = %s WHERE id = %s RETURNING id, title, done;",
+        }
         self._init_schema()
 
     def _init_schema(self) -> None:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id SERIAL PRIMARY KEY,
-                title TEXT NOT NULL,
-                done BOOLEAN NOT NULL DEFAULT FALSE
-            );
-            """
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id SERIAL PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    done BOOLEAN NOT NULL DEFAULT FALSE
+                );
+                """
+            )
 
     def _row_to_dict(self, row: tuple) -> Dict[str, Any]:
         return {"id": row[0], "title": row[1], "done": bool(row[2])}
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT id, title, done FROM tasks ORDER BY id ASC;")
-        return [self._row_to_dict(r) for r in cur.fetchall()]
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT id, title, done FROM tasks ORDER BY id ASC;").fetchall()
+        return [self._row_to_dict(r) for r in rows]
 
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT id, title, done FROM tasks WHERE id = %s;", (task_id,))
-        row = cur.fetchone()
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT id, title, done FROM tasks WHERE id = %s;", (task_id,)).fetchone()
         return self._row_to_dict(row) if row else None
 
     def create_task(self, title: str) -> Dict[str, Any]:
-        cur = self.conn.cursor()
-        cur.execute("INSERT INTO tasks (title, done) VALUES (%s, FALSE) RETURNING id, title, done;", (title,))
-        row = cur.fetchone()
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            row = conn.execute("INSERT INTO tasks (title, done) VALUES (%s, FALSE) RETURNING id, title, done;", (title,)).fetchone()
         return self._row_to_dict(row)  # type: ignore
 
     def update_task(self, task_id: int, title: Optional[str], done: Optional[bool]) -> Optional[Dict[str, Any]]:
         if title is None and done is None:
             return self.get_task(task_id)
-        sets = []
         params: List[Any] = []
         if title is not None:
-            sets.append("title = %s")
             params.append(title)
         if done is not None:
-            sets.append("done = %s")
             params.append(bool(done))
         params.append(task_id)
-        sql = f"UPDATE tasks SET {', '.join(sets)} WHERE id = %s RETURNING id, title, done;"
-        cur = self.conn.cursor()
-        cur.execute(sql, tuple(params))
-        row = cur.fetchone()
-        self.conn.commit()
+        sql = self._update_sqls[(title is not None, done is not None)]
+        with self.pool.connection() as conn:
+            row = conn.execute(sql, tuple(params)).fetchone()
         return self._row_to_dict(row) if row else None
 
     def delete_task(self, task_id: int) -> bool:
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM tasks WHERE id = %s;", (task_id,))
-        deleted = cur.rowcount > 0
-        self.conn.commit()
-        return deleted
+        with self.pool.connection() as conn:
+            return conn.execute("DELETE FROM tasks WHERE id = %s;", (task_id,)).rowcount > 0
+
+    def bulk_create_tasks(self, titles: List[str]) -> List[Dict[str, Any]]:
+        if not titles:
+            return []
+        rows = []
+        # One transaction (single commit) even though the pool connections are autocommit
+        with self.pool.connection() as conn, conn.transaction(), conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO tasks (title, done) VALUES (%s, FALSE) RETURNING id, title, done;",
+                [(title,) for title in titles],
+                returning=True,
+            )
+            while True:
+                rows.append(self._row_to_dict(cur.fetchone()))  # type: ignore
+                if not cur.nextset():
+                    break
+        return rows
 
 
 # Select backend in priority order
@@ -225,22 +397,74 @@ else:
     else:
         _backend = MemoryBackend()
 
-
+if isinstance(_backend, MemoryBackend) and WEB_CONCURRENCY > 1:
+    # Each worker process would get its own store, so tasks would vanish between requests
+    raise RuntimeError(
+        f"The in-memory backend needs a single worker (WEB_CONCURRENCY={WEB_CONCURRENCY}); "
+        "set DATABASE_URL or create backend/tasks.db to run more"
+    )
+
+
+# Query-result cache: keyed by (function, args, epoch); every write bumps the epoch
+_cache: Dict[Any, Any] = {}
+_epoch = 0
+
+
+def _cached(fn: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(fn)
+    def wrapper(*args: Any) -> Any:
+        # MemoryBackend lookups are already plain dict reads
+        if not CACHE_ENABLED or isinstance(_backend, MemoryBackend):
+            return fn(*args)
+        key = (fn.__name__, args, _epoch)
+        rows = _cache.get(key)
+        if rows is None:
+            rows = fn(*args)
+            # Misses (None) aren't cached, and a full cache just stops storing until the next write
+            if rows is None or len(_cache) >= CACHE_MAX_ENTRIES:
+                return rows
+            # The backend built these rows fresh, so the cache can own them without a copy
+            _cache[key] = rows
+        # Rows hold only scalars: shallow copies keep callers from mutating the cached ones
+        return [dict(r) for r in rows] if isinstance(rows, list) else dict(rows)
+    return wrapper
+
+
+def _invalidate() -> None:
+    global _epoch
+    _epoch += 1
+    _cache.clear()
+
+
+@_cached
 def get_all_tasks():
     return _backend.get_all_tasks()
 
 
+@_cached
 def get_task(task_id: int):
     return _backend.get_task(task_id)
 
 
 def create_task(title: str):
-    return _backend.create_task(title)
+    task = _backend.create_task(title)
+    _invalidate()
+    return task
 
 
 def update_task(task_id: int, title: Optional[str] = None, done: Optional[bool] = None):
-    return _backend.update_task(task_id, title, done)
+    task = _backend.update_task(task_id, title, done)
+    _invalidate()
+    return task
 
 
 def delete_task(task_id: int):
-    return _backend.delete_task(task_id)
+    ok = _backend.delete_task(task_id)
+    _invalidate()
+    return ok
+
+
+def bulk_create_tasks(titles: List[str]):
+    tasks = _backend.bulk_create_tasks(titles)
+    _invalidate()
+    return tasks
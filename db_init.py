@@ -11,30 +11,39 @@ DB_PATH = os.path.join(BASE_DIR, 'backend', 'tasks.db')
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
 conn = sqlite3.connect(DB_PATH)
-conn.execute("PRAGMA journal_mode=WAL;")
-cur = conn.cursor()
-
-cur.execute(
+# page_size only applies to a new file, so it goes before journal_mode=WAL
+conn.executescript(
     """
-    CREATE TABLE IF NOT EXISTS tasks (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        done INTEGER NOT NULL DEFAULT 0
-    );
+    PRAGMA page_size=4096;
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
     """
 )
 
-# Clear existing for a fresh seed (dev convenience)
-cur.execute("DELETE FROM tasks;")
-
 seed = [
     ("Learn Flask", 0),
     ("Build a mini project", 0),
     ("Deploy to Vercel", 1),
 ]
-cur.executemany("INSERT INTO tasks (title, done) VALUES (?, ?);", seed)
 
-conn.commit()
+# One transaction for the whole seed: a single commit instead of one per statement
+with conn:
+    conn.execute("BEGIN;")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            done BOOLEAN NOT NULL DEFAULT 0
+        );
+        """
+    )
+    # Clear existing for a fresh seed (dev convenience)
+    conn.execute("DELETE FROM tasks;")
+    conn.executemany("INSERT INTO tasks (title, done) VALUES (?, ?);", seed)
+
 conn.close()
 
 print(f"SQLite DB created at {DB_PATH} with 3 tasks.")
@@ -0,0 +1,21 @@
+"""
+Optional AOT build of db.py with mypyc (needs the dev deps: `pip install -r requirements-dev.txt`).
+Run: python setup.py build_ext --inplace
+
+This drops a compiled db extension next to db.py; Python imports it in preference
+to the source. Without mypyc (or without the build, e.g. on Vercel) the pure-Python
+db.py is used.
+"""
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:  # mypy not installed: nothing to compile
+    ext_modules = []
+else:
+    ext_modules = mypycify(["db.py"])
+
+setup(
+    name="mini-project-db",
+    ext_modules=ext_modules,
+)
@@ -1,10 +1,11 @@
 import os
 import json
+import sqlite3
 import pytest
 
 # Force in-memory backend for tests BEFORE importing app
 os.environ["FORCE_BACKEND"] = "memory"
-from api.app import app  # noqa: E402
+from api.app import app, db  # noqa: E402
 
 @pytest.fixture()
 def client():
@@ -13,6 +14,18 @@ def client():
         yield c
 
 
+@pytest.fixture()
+def sqlite_client(tmp_path, monkeypatch):
+    # Point the API at a fresh SQLite file for one test
+    def make(path, has_returning=True):
+        monkeypatch.setattr(db, "SQLITE_HAS_RETURNING", has_returning)
+        monkeypatch.setattr(db, "_backend", db.SQLiteBackend(str(path)))
+        app.config.update({"TESTING": True})
+        return app.test_client()
+
+    return make
+
+
 def test_list_empty(client):
     rv = client.get("/api/tasks")
     assert rv.status_code == 200
@@ -61,3 +74,255 @@ def test_delete_and_missing(client):
 
     rv = client.delete("/api/tasks/1")
     assert rv.status_code == 404
+
+
+def test_invalid_bodies(client):
+    rv = client.post("/api/tasks", data="{not json", content_type="application/json")
+    assert rv.status_code == 400
+    assert rv.get_json()["error"] == "Invalid JSON body"
+
+    rv = client.post("/api/tasks", data=json.dumps({}), content_type="application/json")
+    assert rv.status_code == 400
+
+    rv = client.post("/api/tasks", data=json.dumps({"title": "   "}), content_type="application/json")
+    assert rv.status_code == 400
+    assert rv.get_json()["error"] == "'title' is required"
+
+    rv = client.post("/api/tasks", data=json.dumps({"title": "V"}), content_type="application/json")
+    task_id = rv.get_json()["id"]
+
+    rv = client.put(f"/api/tasks/{task_id}", data=json.dumps({"done": "yes"}), content_type="application/json")
+    assert rv.status_code == 400
+
+    rv = client.put(f"/api/tasks/{task_id}", data=json.dumps({"title": ""}), content_type="application/json")
+    assert rv.status_code == 400
+    assert rv.get_json()["error"] == "'title' cannot be empty"
+
+
+def test_etag_not_modified(client):
+    rv = client.get("/api/tasks")
+    etag = rv.headers["ETag"]
+    assert rv.status_code == 200
+
+    rv = client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert rv.status_code == 304
+    assert rv.data == b""
+
+    client.post("/api/tasks", data=json.dumps({"title": "E"}), content_type="application/json")
+    rv = client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert rv.status_code == 200
+    assert rv.headers["ETag"] != etag
+
+
+def test_bulk_create(client):
+    rv = client.post(
+        "/api/tasks:bulk",
+        data=json.dumps([{"title": "Bulk 1"}, {"title": " Bulk 2 "}]),
+        content_type="application/json",
+    )
+    assert rv.status_code == 201
+    tasks = rv.get_json()
+    assert [t["title"] for t in tasks] == ["Bulk 1", "Bulk 2"]
+    assert tasks[1]["id"] == tasks[0]["id"] + 1
+
+    rv = client.get(f"/api/tasks/{tasks[1]['id']}")
+    assert rv.get_json()["title"] == "Bulk 2"
+
+    rv = client.post("/api/tasks:bulk", data=json.dumps({"title": "x"}), content_type="application/json")
+    assert rv.status_code == 400
+
+    rv = client.post("/api/tasks:bulk", data=json.dumps([{"title": ""}]), content_type="application/json")
+    assert rv.status_code == 400
+    assert rv.get_json()["error"] == "'title' is required - at `$[0]`"
+
+    rv = client.post("/api/tasks:bulk", data=json.dumps([{"title": "t"}] * 1001), content_type="application/json")
+    assert rv.status_code == 413
+    assert rv.get_json()["error"] == "At most 1000 tasks per bulk request"
+
+    rv = client.post("/api/tasks:bulk", data=b"[" + b" " * (1024 * 1024) + b"]", content_type="application/json")
+    assert rv.status_code == 413
+    assert rv.get_json()["error"] == "Request body too large"
+
+
+def test_bulk_create_rejects_malformed_json(client):
+    before = len(client.get("/api/tasks").get_json())
+    for body in (
+        b'[{"title":"a"} {"title":"b"}]',
+        b'[{"title":"a"}]]',
+        b'[{"title":"a"}] junk',
+        b"\xff\xfe",
+        b"",
+    ):
+        rv = client.post("/api/tasks:bulk", data=body, content_type="application/json")
+        assert rv.status_code == 400, body
+        assert rv.get_json()["error"] == "Invalid JSON body"
+    assert len(client.get("/api/tasks").get_json()) == before
+
+
+def test_cors_preflight(client):
+    rv = client.options("/api/tasks/1", headers={"Origin": "http://localhost:5500"})
+    assert rv.status_code == 204
+    assert rv.headers["Access-Control-Allow-Origin"] == "http://localhost:5500"
+    assert "PUT" in rv.headers["Access-Control-Allow-Methods"]
+
+    rv = client.get("/api/tasks")
+    assert rv.headers["Access-Control-Allow-Origin"] == "http://localhost:5500"
+
+    rv = client.options("/nonexistent")
+    assert rv.status_code == 404
+    assert "Access-Control-Allow-Origin" not in rv.headers
+
+    rv = client.options("/api/nope")
+    assert rv.status_code == 404
+
+
+def test_non_numeric_id(client):
+    rv = client.get("/api/tasks/abc")
+    assert rv.status_code == 404
+    rv = client.get("/api/tasks/-1")
+    assert rv.status_code == 404
+
+
+def test_oversized_id(client):
+    rv = client.get("/api/tasks/" + "9" * 5000)
+    assert rv.status_code == 404
+
+
+def test_health(client):
+    for _ in range(2):
+        rv = client.get("/api/health")
+        assert rv.status_code == 200
+        assert rv.get_json() == {"status": "ok"}
+        assert rv.headers["Access-Control-Allow-Origin"] == "http://localhost:5500"
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_sqlite_crud_and_bulk(sqlite_client, tmp_path, has_returning):
+    c = sqlite_client(tmp_path / "tasks.db", has_returning)
+
+    rv = c.post("/api/tasks", data=json.dumps({"title": "S"}), content_type="application/json")
+    assert rv.status_code == 201
+    assert rv.get_json() == {"id": 1, "title": "S", "done": False}
+
+    rv = c.put("/api/tasks/1", data=json.dumps({"done": True}), content_type="application/json")
+    assert rv.get_json() == {"id": 1, "title": "S", "done": True}
+    rv = c.put("/api/tasks/1", data=json.dumps({"title": "T"}), content_type="application/json")
+    assert rv.get_json() == {"id": 1, "title": "T", "done": True}
+    rv = c.put("/api/tasks/9", data=json.dumps({"title": "X"}), content_type="application/json")
+    assert rv.status_code == 404
+
+    rv = c.post("/api/tasks:bulk", data=json.dumps([{"title": "B1"}, {"title": "B2"}]), content_type="application/json")
+    assert rv.status_code == 201
+    created = rv.get_json()
+    assert [t["id"] for t in created] == [2, 3]
+
+    listed = c.get("/api/tasks").get_json()
+    assert listed[1:] == created
+    assert all(t["done"] is False for t in listed[1:])
+    assert listed[0]["done"] is True
+
+    assert c.delete("/api/tasks/1").status_code == 200
+    assert c.get("/api/tasks/1").status_code == 404
+
+
+def test_sqlite_legacy_integer_done(sqlite_client, tmp_path):
+    # Files seeded before done was declared BOOLEAN still come back as JSON booleans
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, done INTEGER NOT NULL DEFAULT 0);"
+    )
+    conn.executemany("INSERT INTO tasks (title, done) VALUES (?, ?);", [("Old", 1), ("Older", 0)])
+    conn.commit()
+    conn.close()
+
+    c = sqlite_client(path)
+    assert c.get("/api/tasks").get_json() == [
+        {"id": 1, "title": "Old", "done": True},
+        {"id": 2, "title": "Older", "done": False},
+    ]
+    assert c.get("/api/tasks/1").get_json()["done"] is True
+
+    rv = c.put("/api/tasks/2", data=json.dumps({"done": True}), content_type="application/json")
+    assert rv.get_json()["done"] is True
+    rv = c.post("/api/tasks", data=json.dumps({"title": "New"}), content_type="application/json")
+    assert rv.get_json()["done"] is False
+
+
+def test_sqlite_query_cache(sqlite_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "CACHE_ENABLED", True)
+    monkeypatch.setattr(db, "_cache", {})
+    path = tmp_path / "cached.db"
+    c = sqlite_client(path)
+    c.post("/api/tasks", data=json.dumps({"title": "C"}), content_type="application/json")
+
+    # A second read is served from the cache: a write behind its back goes unseen
+    assert c.get("/api/tasks").get_json() == [{"id": 1, "title": "C", "done": False}]
+    assert c.get("/api/tasks/1").get_json()["title"] == "C"
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE tasks SET title = 'Outside' WHERE id = 1;")
+    conn.commit()
+    conn.close()
+    assert c.get("/api/tasks").get_json()[0]["title"] == "C"
+    assert c.get("/api/tasks/1").get_json()["title"] == "C"
+
+    # Callers get copies, so mutating a result leaves the cached rows alone
+    db.get_all_tasks()[0]["title"] = "Mutated"
+    db.get_task(1)["title"] = "Mutated"
+    assert db.get_all_tasks()[0]["title"] == "C"
+    assert db.get_task(1)["title"] == "C"
+
+    # Every write path clears the cache
+    writes = [
+        lambda: c.post("/api/tasks", data=json.dumps({"title": "D"}), content_type="application/json"),
+        lambda: c.put("/api/tasks/1", data=json.dumps({"done": True}), content_type="application/json"),
+        lambda: c.post("/api/tasks:bulk", data=json.dumps([{"title": "E"}]), content_type="application/json"),
+        lambda: c.delete("/api/tasks/2"),
+    ]
+    for write in writes:
+        c.get("/api/tasks")
+        c.get("/api/tasks/1")
+        assert db._cache
+        write()
+        assert db._cache == {}
+    assert c.get("/api/tasks").get_json() == [
+        {"id": 1, "title": "Outside", "done": True},
+        {"id": 3, "title": "E", "done": False},
+    ]
+
+    # A missing task is not cached
+    assert c.get("/api/tasks/99").status_code == 404
+    assert not any(key[:2] == ("get_task", (99,)) for key in db._cache)
+
+
+def test_sqlite_failed_bulk_rolls_back(tmp_path):
+    path = tmp_path / "tasks.db"
+    backend = db.SQLiteBackend(str(path))
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON tasks WHEN NEW.title = 'bad' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END;"
+    )
+    conn.commit()
+    conn.close()
+    with pytest.raises(sqlite3.IntegrityError):
+        backend.bulk_create_tasks(["ok", "bad"])
+    # The next write must not commit the half-inserted batch
+    backend.create_task("after")
+    assert [t["title"] for t in backend.get_all_tasks()] == ["after"]
+
+
+def test_memory_compaction_keeps_survivors():
+    backend = db.MemoryBackend()
+    backend.bulk_create_tasks([f"T{n}" for n in range(1, 11)])
+    # Deleting 6 of 10 tombstones more than half the slots, which triggers compaction
+    for task_id in (1, 2, 4, 5, 7, 9):
+        assert backend.delete_task(task_id)
+    assert backend.get_task(1) is None
+    assert backend.get_task(8) == {"id": 8, "title": "T8", "done": False}
+    assert backend.update_task(10, "Ten", True) == {"id": 10, "title": "Ten", "done": True}
+    assert backend.update_task(2, "Gone", None) is None
+    assert [t["id"] for t in backend.get_all_tasks()] == [3, 6, 8, 10]
+    assert backend.create_task("New")["id"] == 11
+    assert backend.delete_task(3)
+    assert [t["title"] for t in backend.get_all_tasks()] == ["T6", "T8", "Ten", "New"]